@@ -0,0 +1,222 @@
+import json
+import re
+
+from agent.rag import format_single_plan
+
+
+# ----------------------------
+# Attribute aliases
+# ----------------------------
+PRICE_ALIASES = [
+    "price", "prices", "pricing", "cost", "costs",
+    "how much", "charge", "fee"
+]
+
+# Noun phrases only: the bare verb "support" is too common in feature questions
+POLICY_ALIASES = {
+    "refund_policy": ["refund", "refunds", "money back"],
+    "support_policy": ["customer support", "help desk", "24 7 support"],
+}
+
+# Words that never identify a feature on their own
+FEATURE_STOPWORDS = {
+    "a", "an", "and", "the", "to", "of", "per", "up", "in", "on",
+    "with", "for", "is", "does", "do", "have", "has", "plan", "month"
+}
+
+# Question filler that carries no fact on its own; any other word the index
+# doesn't know ("8k", "storage") means the question is outside the KB
+QUERY_WORDS = {
+    "a", "about", "all", "allow", "allows", "also", "an", "and", "any", "are",
+    "available", "be", "between", "both", "can", "compare", "come", "comes",
+    "could", "difference", "do", "does", "each", "feature", "features", "for",
+    "get", "give", "has", "have", "how", "i", "if", "in", "include", "included",
+    "includes", "including", "is", "it", "know", "like", "list", "many", "me",
+    "month", "monthly", "my", "need", "of", "offer", "offers", "on", "or", "per",
+    "plan", "plans", "please", "s", "show", "support", "supports", "tell", "than",
+    "that", "the", "there", "this", "tier", "to", "versus", "vs", "want", "what",
+    "whats", "which", "will", "with", "would", "you", "your"
+}
+
+# Plan-like words with no matching plan in the KB
+UNKNOWN_PLAN_WORDS = {"premium", "enterprise", "business", "team", "free", "starter"}
+
+
+def tokenize(text: str) -> list:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def _contains(text: str, alias: str) -> bool:
+    """Whole-word match of an alias inside normalized text"""
+    return f" {alias} " in f" {text} "
+
+
+def build_fact_index(path: str) -> dict:
+    """Precompute plan/attribute lookups over the structured knowledge base"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    plans = {}
+    plan_aliases = {}
+    feature_terms = {}
+    known_words = set()
+
+    for plan in data.get("pricing_plans", []):
+        name = plan.get("name", "")
+        if not name:
+            continue
+
+        plans[name] = plan
+
+        # "Pro Plan" → "pro plan", "pro"
+        full = " ".join(tokenize(name))
+        plan_aliases[full] = name
+        short = full.replace(" plan", "").strip()
+        if short:
+            plan_aliases[short] = name
+
+        known_words.update(tokenize(name))
+
+        # "4k" → {"Pro Plan": "4K video resolution"}
+        for feature in plan.get("features", []):
+            known_words.update(tokenize(feature))
+            for term in set(tokenize(feature)) - FEATURE_STOPWORDS:
+                if term.isdigit():
+                    continue
+                feature_terms.setdefault(term, {}).setdefault(name, feature)
+
+    policies = data.get("policies", {})
+    policy_aliases = {}
+    for key in policies:
+        # "refund_policy" → "refund policy"
+        policy_aliases[" ".join(tokenize(key.replace("_", " ")))] = key
+        for alias in POLICY_ALIASES.get(key, []):
+            policy_aliases[alias] = key
+
+    return {
+        "plans": plans,
+        # Longest aliases first so "pro plan" wins over "pro"
+        "plan_aliases": sorted(plan_aliases.items(), key=lambda kv: -len(kv[0])),
+        "feature_terms": feature_terms,
+        "known_words": known_words | {t for alias in PRICE_ALIASES for t in tokenize(alias)},
+        "policies": policies,
+        "policy_aliases": sorted(policy_aliases.items(), key=lambda kv: -len(kv[0])),
+    }
+
+
+def _match_plans(text: str, index: dict) -> list:
+    matched = []
+    for alias, name in index["plan_aliases"]:
+        if _contains(text, alias) and name not in matched:
+            matched.append(name)
+    return matched
+
+
+def _match_policy(text: str, index: dict):
+    for alias, key in index["policy_aliases"]:
+        if _contains(text, alias):
+            return key
+    return None
+
+
+def _match_feature_term(tokens: list, index: dict, distinctive_only: bool = False):
+    """Pick the most specific feature term in the query (offered by the fewest plans)"""
+    candidates = [t for t in tokens if t in index["feature_terms"]]
+    if distinctive_only:
+        # Terms every plan shares ("video", "resolution") say nothing on their own
+        candidates = [
+            t for t in candidates
+            if len(index["feature_terms"][t]) < len(index["plans"])
+        ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda t: len(index["feature_terms"][t]))
+
+
+def _unknown_words(tokens: list, index: dict) -> list:
+    """Content words the index has no fact for ("8k", "storage", "voiceover")"""
+    return [t for t in tokens if t not in QUERY_WORDS and t not in index["known_words"]]
+
+
+def _names_unknown_plan(tokens: list, index: dict) -> bool:
+    """True for "premium plan" style mentions that match no KB plan"""
+    plan_words = {t for alias, _ in index["plan_aliases"] for t in alias.split()}
+    for i, token in enumerate(tokens):
+        if token in plan_words:
+            continue
+        if token in UNKNOWN_PLAN_WORDS:
+            return True
+        followed_by_plan = i + 1 < len(tokens) and tokens[i + 1] in ("plan", "plans", "tier")
+        if followed_by_plan and token not in QUERY_WORDS:
+            return True
+    return False
+
+
+def _format_policy(key: str, value: str) -> str:
+    clean_key = key.replace("_", " ").title()
+    return f"📝 {clean_key}: {value}"
+
+
+def lookup_fact(query: str, index: dict):
+    """
+    Answer plan/policy questions straight from the fact index.
+    Returns None when no fact matches so the caller can fall back to RAG.
+    """
+    if not index:
+        return None
+
+    tokens = tokenize(query)
+    text = " ".join(tokens)
+
+    # 📜 Policy questions ("what's the refund policy", "is customer support on pro")
+    policy_key = _match_policy(text, index)
+
+    # ❓ Unknown plan or feature → let RAG handle it rather than guess
+    if not policy_key and (_names_unknown_plan(tokens, index) or _unknown_words(tokens, index)):
+        return None
+
+    plans = _match_plans(text, index)
+    asks_price = any(_contains(text, alias) for alias in PRICE_ALIASES)
+    feature_term = _match_feature_term(tokens, index, distinctive_only=not plans)
+
+    # 💰 Price questions ("how much is the pro plan", "how much does 4k cost")
+    if asks_price:
+        if plans:
+            targets = plans
+        elif feature_term:
+            targets = list(index["feature_terms"][feature_term])
+        else:
+            targets = list(index["plans"])
+        return "\n".join(
+            f"💰 {name}: {index['plans'][name].get('price', 'N/A')}"
+            for name in targets
+        )
+
+    # ✨ Feature availability ("does basic have 4k", "which plan has 4k")
+    if feature_term:
+        offered = index["feature_terms"][feature_term]
+
+        if not plans:
+            return "\n".join(
+                f"✅ The {name} includes {feature}." for name, feature in offered.items()
+            )
+
+        answers = []
+        for name in plans:
+            if name in offered:
+                answers.append(f"✅ Yes, the {name} includes {offered[name]}.")
+            else:
+                answers.append(
+                    f"❌ No, the {name} does not include that. "
+                    f"It is available on the {', '.join(offered)}."
+                )
+        return "\n".join(answers)
+
+    if policy_key:
+        return _format_policy(policy_key, index["policies"][policy_key])
+
+    # 📋 Feature list / plan overview ("what does pro include")
+    if plans:
+        return "\n\n".join(format_single_plan(index["plans"][name]) for name in plans)
+
+    return None
@@ -3,7 +3,8 @@ from agent import state
 from agent.state import AgentState
 from agent.intent import classify_intent
 from agent.rag import get_answer
-from agent.validators import is_valid_email
+from agent.facts import lookup_fact
+from agent.validators import is_valid_email, is_valid_name, is_valid_platform
 from agent.lead_store import save_lead, lead_exists, update_existing_lead
 from agent.mock_api import submit_lead_to_crm
 
@@ -13,13 +14,9 @@ from agent.mock_api import submit_lead_to_crm
 
 
 # --------------------------------------------------
-# NODE 1: Detect Intent + Confidence (Memory Aware)
+# NODE 1: Detect Intent + Confidence
 # --------------------------------------------------
 def detect_intent(state: AgentState):
-    # 🧠 Memory-aware intent bias
-    if state.lead_step and state.lead_step != "done":
-        return state
-
     # 🎯 Intent classification
     intent, confidence = classify_intent(state.user_input)
     state.intent = intent
@@ -45,20 +42,22 @@ def handle_greeting(state: AgentState):
 
 
 # --------------------------------------------------
-# NODE 3: Inquiry Handler (RAG)
+# NODE 3: Inquiry Handler (Fact Index → RAG)
 # --------------------------------------------------
 def handle_inquiry(state: AgentState):
-    state.response = get_answer(state.user_input, handle_inquiry.retriever)
+    # ⚡ Structured fact lookup first, retrieval only when nothing matches
+    answer = lookup_fact(state.user_input, handle_inquiry.fact_index)
+    if answer is None:
+        answer = get_answer(state.user_input, handle_inquiry.retriever)
+
+    state.response = answer
     return state
 
 
 # --------------------------------------------------
-# NODE 4: High-Intent / Lead Capture Handler
+# NODE 4: High-Intent Handler (starts lead capture)
 # --------------------------------------------------
 def handle_high_intent(state: AgentState):
-    from agent.validators import is_valid_email
-    from agent.lead_store import save_lead, lead_exists, update_existing_lead
-
     # ✅ Already captured → polite acknowledgement
     if state.lead_captured:
         state.response = (
@@ -72,63 +71,101 @@ def handle_high_intent(state: AgentState):
     if state.lead_step == "":
         state.lead_step = "name"
         state.response = "That’s great! 🚀 May I know your name?"
-        return state
 
-    # 🧠 STEP 1 → save name, ask email
-    if state.lead_step == "name":
-        state.name = state.user_input.strip()
-        state.lead_step = "email"
-        state.response = "Thanks! Could you please share your email address?"
+    return state
+
+
+# --------------------------------------------------
+# LEAD CAPTURE STEPS (routed on lead_step, skip intent detection)
+# --------------------------------------------------
+LEAD_STEPS = ("name", "email", "platform")
+
+
+def capture_name(state: AgentState):
+    # 🧠 STEP 1 → validate + save name, ask email
+    name = state.user_input.strip()
+
+    if not is_valid_name(name):
+        state.response = "❌ Please enter your name using letters only (example: Alex)."
         return state
 
+    state.name = name
+    state.lead_step = "email"
+    state.response = "Thanks! Could you please share your email address?"
+    return state
+
+
+def capture_email(state: AgentState):
     # 🧠 STEP 2 → validate + save email
-    if state.lead_step == "email":
-        email = state.user_input.strip()
-
-        if not is_valid_email(email):
-            state.response = (
-                "❌ That doesn’t look like a valid email address.\n"
-                "📧 Please enter a valid email (example: name@example.com)."
-            )
-            return state
-
-        state.email = email
-        state.lead_step = "platform"
-        state.response = "Awesome! Which platform do you create content for?"
-        return state
+    email = state.user_input.strip()
 
-    # 🧠 STEP 3 → save platform, finalize
-    if state.lead_step == "platform":
-        state.platform = state.user_input.strip()
-
-        if lead_exists(state.email):
-            update_existing_lead(
-                email=state.email,
-                new_plan=state.selected_plan or None
-            )
-        else:
-            lead_payload = {
-                "name": state.name,
-                "email": state.email,
-                "platform": state.platform,
-                "plan": state.selected_plan or "Not specified"
-            }
-            
-            save_lead(**lead_payload)
-            
-            # 📡 MOCK API CALL
-            submit_lead_to_crm(lead_payload)
-
-
-        state.lead_step = "done"
-        state.lead_captured = True
+    if not is_valid_email(email):
         state.response = (
-            "✅ Thanks! Your details have been recorded. "
-            "Our team will contact you soon.\n\n"
-            "😊 Is there anything else I can help you with?"
+            "❌ That doesn’t look like a valid email address.\n"
+            "📧 Please enter a valid email (example: name@example.com)."
         )
         return state
 
+    state.email = email
+    state.lead_step = "platform"
+    state.response = "Awesome! Which platform do you create content for?"
+    return state
+
+
+def capture_platform(state: AgentState):
+    # 🧠 STEP 3 → validate + save platform, finalize
+    platform = state.user_input.strip()
+
+    if not is_valid_platform(platform):
+        state.response = "❌ Please enter the platform name (example: YouTube, Instagram)."
+        return state
+
+    state.platform = platform
+
+    # 💾 Storage + CRM are only touched here, once the lead is complete
+    if lead_exists(state.email):
+        update_existing_lead(
+            email=state.email,
+            new_plan=state.selected_plan or None
+        )
+    else:
+        lead_payload = {
+            "name": state.name,
+            "email": state.email,
+            "platform": state.platform,
+            "plan": state.selected_plan or "Not specified"
+        }
+
+        save_lead(**lead_payload)
+
+        # 📡 MOCK API CALL
+        submit_lead_to_crm(lead_payload)
+
+
+    state.lead_step = "done"
+    state.lead_captured = True
+    state.response = (
+        "✅ Thanks! Your details have been recorded. "
+        "Our team will contact you soon.\n\n"
+        "😊 Is there anything else I can help you with?"
+    )
+    return state
+
+
+LEAD_CAPTURE_NODES = {
+    "name": capture_name,
+    "email": capture_email,
+    "platform": capture_platform,
+}
+
+
+def route_turn(state: AgentState):
+    # 🧠 Mid lead capture → jump straight to the step's node, otherwise full intent detection
+    # (plain nodes rather than a nested compiled graph: nesting added ~1 ms per turn)
+    if state.lead_step in LEAD_STEPS:
+        return state.lead_step
+    return "detect_intent"
+
 
 
 
@@ -136,10 +173,11 @@ def handle_high_intent(state: AgentState):
 # --------------------------------------------------
 # GRAPH BUILDER
 # --------------------------------------------------
-def build_graph(retriever):
+def build_graph(retriever, fact_index=None):
 
-    # Inject retriever safely (no lambda)
+    # Inject retriever + fact index safely (no lambda)
     handle_inquiry.retriever = retriever
+    handle_inquiry.fact_index = fact_index
 
     graph = StateGraph(AgentState)
 
@@ -148,9 +186,14 @@ def build_graph(retriever):
     graph.add_node("greeting", handle_greeting)
     graph.add_node("inquiry", handle_inquiry)
     graph.add_node("high_intent", handle_high_intent)
+    for step, node in LEAD_CAPTURE_NODES.items():
+        graph.add_node(step, node)
 
-    # Entry point
-    graph.set_entry_point("detect_intent")
+    # Entry point (lead-capture turns skip intent detection)
+    graph.set_conditional_entry_point(
+        route_turn,
+        {"detect_intent": "detect_intent", **{step: step for step in LEAD_STEPS}},
+    )
 
     # Conditional routing
     graph.add_conditional_edges(
@@ -167,5 +210,7 @@ def build_graph(retriever):
     graph.add_edge("greeting", END)
     graph.add_edge("inquiry", END)
     graph.add_edge("high_intent", END)
+    for step in LEAD_STEPS:
+        graph.add_edge(step, END)
 
     return graph.compile()
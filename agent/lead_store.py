@@ -1,11 +1,246 @@
+import csv
 import json
+import os
+import textwrap
 from datetime import datetime
 from pathlib import Path
 
 
 LEADS_FILE = Path("data/leads.json")
+STATS_FILE = Path("data/lead_stats.json")
 
+LEAD_FIELDS = [
+    "name", "email", "platform", "interested_plan",
+    "created_at", "last_contacted_at", "reinterest_count"
+]
 
+READ_CHUNK_SIZE = 64 * 1024
+IMPORT_BATCH_SIZE = 500
+
+
+# --------------------------------------------------
+# Streaming file helpers
+# --------------------------------------------------
+def iter_leads(path: Path = None):
+    """Yield leads one at a time without loading the whole JSON array"""
+    path = Path(path or LEADS_FILE)
+    if not path.exists():
+        return
+
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            buffer += chunk
+            pos = 0
+
+            while True:
+                # Skip array punctuation between lead objects
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,[":
+                    pos += 1
+                if pos >= len(buffer) or buffer[pos] == "]":
+                    break
+                try:
+                    lead, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if not chunk:
+                        raise
+                    break  # object continues in the next chunk
+                yield lead
+
+            buffer = buffer[pos:]
+            if not chunk or buffer.startswith("]"):
+                return
+
+
+def _format_entry(lead: dict) -> str:
+    return textwrap.indent(json.dumps(lead, indent=4), "    ")
+
+
+def _file_newline() -> str:
+    """Line ending already used by leads.json, so appends/rewrites don't mix styles"""
+    if not LEADS_FILE.exists():
+        return "\n"
+    with open(LEADS_FILE, "rb") as f:
+        return "\r\n" if b"\r\n" in f.read(4096) else "\n"
+
+
+def _append_leads(leads: list):
+    """Append leads to the JSON array in place, without rewriting existing entries"""
+    if not leads:
+        return
+
+    newline = _file_newline()
+    body = ",\n".join(_format_entry(lead) for lead in leads)
+
+    if not LEADS_FILE.exists() or LEADS_FILE.stat().st_size == 0:
+        LEADS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(LEADS_FILE, "wb") as f:
+            f.write(f"[\n{body}\n]".replace("\n", newline).encode("utf-8"))
+        return
+
+    with open(LEADS_FILE, "r+b") as f:
+        close_at = _find_last_non_space(f, f.seek(0, os.SEEK_END))
+        f.seek(close_at)
+        if f.read(1) != b"]":
+            raise ValueError(f"{LEADS_FILE} is not a JSON array")
+
+        previous = _find_last_non_space(f, close_at)
+        f.seek(previous)
+        separator = "\n" if f.read(1) == b"[" else ",\n"
+
+        # Drop everything after the last entry (including its trailing newline)
+        f.seek(previous + 1)
+        f.truncate()
+        f.write(f"{separator}{body}\n]".replace("\n", newline).encode("utf-8"))
+
+
+def _find_last_non_space(f, end: int) -> int:
+    """Offset of the last non-whitespace byte before `end`, reading backwards"""
+    while end > 0:
+        start = max(0, end - 4096)
+        f.seek(start)
+        block = f.read(end - start)
+        stripped = block.rstrip()
+        if stripped:
+            return start + len(stripped) - 1
+        end = start
+    raise ValueError(f"{LEADS_FILE} is empty")
+
+
+def _rewrite_leads(transform):
+    """Stream every lead through `transform` into a new file, then swap it in"""
+    tmp_path = LEADS_FILE.with_suffix(".json.tmp")
+
+    with open(tmp_path, "w", encoding="utf-8", newline=_file_newline()) as out:
+        out.write("[")
+        first = True
+        for lead in iter_leads():
+            out.write("\n" if first else ",\n")
+            out.write(_format_entry(transform(lead)))
+            first = False
+        out.write("\n]")
+
+    os.replace(tmp_path, LEADS_FILE)
+
+
+def _field(lead: dict, key: str) -> str:
+    # Short CSV rows give None for missing columns
+    value = lead.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _normalize_lead(lead: dict) -> dict:
+    """
+    Fill in fields missing from older/imported records.
+    Raises ValueError when a field can't be coerced (e.g. reinterest_count "n/a").
+    """
+    if not isinstance(lead, dict):
+        raise ValueError(f"lead must be an object, got {type(lead).__name__}")
+
+    created_at = _field(lead, "created_at") or _field(lead, "timestamp") or datetime.now().isoformat()
+    reinterest_count = _field(lead, "reinterest_count") or "0"
+
+    try:
+        reinterest_count = int(reinterest_count)
+    except ValueError:
+        raise ValueError(f"invalid reinterest_count: {reinterest_count!r}")
+
+    return {
+        "name": _field(lead, "name"),
+        "email": _field(lead, "email"),
+        "platform": _field(lead, "platform"),
+        "interested_plan": _field(lead, "interested_plan") or _field(lead, "plan") or "Not specified",
+        "created_at": created_at,
+        "last_contacted_at": _field(lead, "last_contacted_at") or created_at,
+        "reinterest_count": reinterest_count
+    }
+
+
+# --------------------------------------------------
+# Aggregate counters (dashboard queries)
+# --------------------------------------------------
+def _empty_stats() -> dict:
+    return {
+        "total_leads": 0,
+        "by_plan": {},
+        "by_platform": {},
+        "by_day": {},
+        "reinterest_total": 0,
+        "reinterest_by_plan": {}
+    }
+
+
+def _bump(counter: dict, key: str, amount: int = 1):
+    counter[key] = counter.get(key, 0) + amount
+    if counter[key] == 0:
+        del counter[key]
+
+
+def _count_lead(stats: dict, lead: dict):
+    lead = _normalize_lead(lead)
+    plan = lead["interested_plan"]
+
+    stats["total_leads"] += 1
+    _bump(stats["by_plan"], plan)
+    _bump(stats["by_platform"], lead["platform"])
+    _bump(stats["by_day"], lead["created_at"][:10])
+
+    if lead["reinterest_count"]:
+        stats["reinterest_total"] += lead["reinterest_count"]
+        _bump(stats["reinterest_by_plan"], plan, lead["reinterest_count"])
+
+
+def _leads_file_signature():
+    """Size + mtime of leads.json, used to spot edits made outside this module"""
+    if not LEADS_FILE.exists():
+        return None
+    info = LEADS_FILE.stat()
+    return {"size": info.st_size, "mtime_ns": info.st_mtime_ns}
+
+
+def _save_stats(stats: dict):
+    # Called after every write to leads.json, so the signature matches the file
+    stats["leads_file"] = _leads_file_signature()
+    tmp_path = STATS_FILE.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=4)
+    os.replace(tmp_path, STATS_FILE)
+
+
+def rebuild_lead_stats() -> dict:
+    """Recompute counters with a single streaming pass over leads.json"""
+    stats = _empty_stats()
+    for lead in iter_leads():
+        try:
+            _count_lead(stats, lead)
+        except ValueError as e:
+            print(f"⚠️ Not counting lead {lead.get('email', '')!r}: {e}")
+
+    _save_stats(stats)
+    return stats
+
+
+def get_lead_stats() -> dict:
+    """
+    Counts by plan, platform and day plus reinterest rollups.
+    Rebuilt automatically when leads.json changed behind our back (checkout, manual edit).
+    """
+    if not STATS_FILE.exists():
+        return rebuild_lead_stats()
+
+    with open(STATS_FILE, "r", encoding="utf-8") as f:
+        stats = json.load(f)
+
+    if stats.get("leads_file") != _leads_file_signature():
+        return rebuild_lead_stats()
+    return stats
+
+
+# --------------------------------------------------
+# Lead operations
+# --------------------------------------------------
 def save_lead(name: str, email: str, platform: str, plan: str):
     """Save a new lead with timestamp"""
     now = datetime.now().isoformat()
@@ -20,29 +255,18 @@ def save_lead(name: str, email: str, platform: str, plan: str):
         "reinterest_count": 0
     }
 
-    if LEADS_FILE.exists():
-        with open(LEADS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    else:
-        data = []
-
-    data.append(lead)
+    stats = get_lead_stats()
+    _append_leads([lead])
 
-    with open(LEADS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    _count_lead(stats, lead)
+    _save_stats(stats)
 
 
 
 def lead_exists(email: str) -> bool:
     """Check if a lead with the same email already exists"""
-    if not LEADS_FILE.exists():
-        return False
-
-    with open(LEADS_FILE, "r", encoding="utf-8") as f:
-        leads = json.load(f)
-
     email = email.lower().strip()
-    return any(lead.get("email", "").lower() == email for lead in leads)
+    return any(lead.get("email", "").lower() == email for lead in iter_leads())
 
 
 
@@ -51,17 +275,157 @@ def update_existing_lead(email: str, new_plan: str = None):
     if not LEADS_FILE.exists():
         return
 
-    with open(LEADS_FILE, "r", encoding="utf-8") as f:
-        leads = json.load(f)
+    stats = get_lead_stats()
+    email = email.lower()
+    found = False
+
+    def touch(lead):
+        nonlocal found
+        if found or lead.get("email", "").lower() != email:
+            return lead
+
+        found = True
+        # Same fallbacks as _count_lead so the counters stay in sync
+        current = _normalize_lead(lead)
+        old_plan = current["interested_plan"]
+        old_count = current["reinterest_count"]
+
+        lead["last_contacted_at"] = datetime.now().isoformat()
+        lead["reinterest_count"] = old_count + 1
+
+        if new_plan:
+            lead["interested_plan"] = new_plan
+
+        # 📊 Move the lead's rollups to its current plan
+        plan = _normalize_lead(lead)["interested_plan"]
+        _bump(stats["by_plan"], old_plan, -1)
+        _bump(stats["by_plan"], plan)
+        _bump(stats["reinterest_by_plan"], old_plan, -old_count)
+        _bump(stats["reinterest_by_plan"], plan, old_count + 1)
+        stats["reinterest_total"] += 1
+        return lead
+
+    _rewrite_leads(touch)
+
+    if found:
+        _save_stats(stats)
+
+
+# --------------------------------------------------
+# Bulk export / import (JSONL + CSV)
+# --------------------------------------------------
+def _detect_format(path: Path, fmt: str = None) -> str:
+    fmt = (fmt or path.suffix.lstrip(".")).lower()
+    if fmt not in ("jsonl", "csv"):
+        raise ValueError(f"Unsupported lead file format: {fmt!r} (use jsonl or csv)")
+    return fmt
+
+
+def export_leads(path: str, fmt: str = None) -> int:
+    """Stream all leads to a JSONL or CSV file, returns the number exported"""
+    path = Path(path)
+    fmt = _detect_format(path, fmt)
+    count = 0
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=LEAD_FIELDS)
+            writer.writeheader()
+
+        for lead in iter_leads():
+            lead = _normalize_lead(lead)
+            if fmt == "csv":
+                writer.writerow(lead)
+            else:
+                f.write(json.dumps(lead) + "\n")
+            count += 1
+
+    return count
+
+
+def _read_lead_file(path: Path, fmt: str):
+    """Yield (line number, normalized lead or error message) for every row"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_num, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_num, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_num, f"invalid JSON: {e.msg}"
+
+
+def import_leads(path: str, fmt: str = None, skip_existing: bool = True) -> tuple:
+    """
+    Stream leads from a JSONL or CSV file into leads.json in batches.
+    With skip_existing, emails already stored (or repeated in the file) are skipped;
+    each batch is checked with one streaming pass over leads.json, so memory
+    stays bounded by IMPORT_BATCH_SIZE.
+    Malformed rows are reported and skipped instead of aborting the import.
+    Returns (imported, skipped_malformed).
+    """
+    path = Path(path)
+    fmt = _detect_format(path, fmt)
+
+    stats = get_lead_stats()
+    batch = []
+    count = 0
+    skipped = 0
+
+    for line_num, row in _read_lead_file(path, fmt):
+        try:
+            if isinstance(row, str):
+                raise ValueError(row)
+            lead = _normalize_lead(row)
+        except ValueError as e:
+            print(f"⚠️ Skipping {path.name} line {line_num}: {e}")
+            skipped += 1
+            continue
+
+        if not lead["email"]:
+            print(f"⚠️ Skipping {path.name} line {line_num}: missing email")
+            skipped += 1
+            continue
+
+        batch.append(lead)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            count += _flush_import(batch, stats, skip_existing)
+            batch = []
+
+    count += _flush_import(batch, stats, skip_existing)
+    return count, skipped
+
+
+def _drop_known_emails(batch: list) -> list:
+    """Remove leads already in leads.json or repeated within the batch"""
+    emails = {lead["email"].lower() for lead in batch}
+    known = {
+        lead.get("email", "").lower() for lead in iter_leads()
+        if lead.get("email", "").lower() in emails
+    }
+
+    unique = []
+    for lead in batch:
+        email = lead["email"].lower()
+        if email not in known:
+            known.add(email)
+            unique.append(lead)
+    return unique
 
-    for lead in leads:
-        if lead.get("email", "").lower() == email.lower():
-            lead["last_contacted_at"] = datetime.now().isoformat()
-            lead["reinterest_count"] = lead.get("reinterest_count", 0) + 1
 
-            if new_plan:
-                lead["interested_plan"] = new_plan
-            break
+def _flush_import(batch: list, stats: dict, skip_existing: bool) -> int:
+    if skip_existing:
+        batch = _drop_known_emails(batch)
+    if not batch:
+        return 0
 
-    with open(LEADS_FILE, "w", encoding="utf-8") as f:
-        json.dump(leads, f, indent=4)
+    _append_leads(batch)
+    for lead in batch:
+        _count_lead(stats, lead)
+    _save_stats(stats)
+    return len(batch)
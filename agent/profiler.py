@@ -0,0 +1,241 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+
+PROFILE_DIR = Path("profiles")
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+TOP_ALLOCATIONS = 15
+
+# Stack-frame markers used to break down where a turn spends its time
+CATEGORIES = {
+    "classify_intent": ["intent:classify_intent"],
+    "embeddings": ["embed_query", "embed_documents", "SentenceTransformer:encode"],
+    "faiss": ["faiss"],
+    "format_response": ["rag:format_response"],
+    "lead_store_io": ["lead_store:"],
+}
+
+PROFILE_USAGE = "/profile [N] [--alloc] | /profile session <id> [--alloc] | /profile off"
+
+_OFF = nullcontext()
+
+
+def _parse_turns(value: str) -> int:
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(f"turn count must be a positive integer, got {value!r}")
+    return int(value)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+class _Sampler(threading.Thread):
+    """Background thread that periodically records the target thread's stack"""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="autostream-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.samples
+
+
+class TurnProfiler:
+    """
+    On-demand sampling profiler for graph turns.
+    Enable for the next N turns or for one session id; when off, profile()
+    hands back a shared no-op context manager.
+
+    Allocation tracing slows Python code down by an order of magnitude, so it
+    is opt-in and replaces the stack/timing profile for those turns.
+    """
+
+    def __init__(self, output_dir: Path = PROFILE_DIR, interval: float = SAMPLE_INTERVAL):
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.turns_left = 0
+        self.session_id = None
+        self.allocations = False
+        self.active = False
+        self._turn = 0
+
+    def enable(self, turns: int = None, session_id: str = None, allocations: bool = False):
+        if turns is not None and turns < 1:
+            raise ValueError("turn count must be a positive integer")
+
+        self.turns_left = turns or 0
+        self.session_id = session_id
+        self.allocations = allocations
+        self.active = bool(self.turns_left or self.session_id)
+
+    def disable(self):
+        self.enable()
+
+    def handle_command(self, args: list) -> str:
+        """Apply "/profile" arguments, raising ValueError on bad input"""
+        allocations = "--alloc" in args
+        args = [arg for arg in args if arg != "--alloc"]
+        mode = " (allocations)" if allocations else ""
+
+        if args == ["off"]:
+            self.disable()
+            return "profiler: off"
+
+        if len(args) == 2 and args[0] == "session":
+            self.enable(session_id=args[1], allocations=allocations)
+            return f"profiler: on for session {args[1]}{mode}"
+
+        if len(args) <= 1:
+            turns = _parse_turns(args[0]) if args else 1
+            self.enable(turns=turns, allocations=allocations)
+            return f"profiler: on for next {turns} turn(s){mode}"
+
+        raise ValueError(f"usage: {PROFILE_USAGE}")
+
+    def configure_from_env(self):
+        """AUTOSTREAM_PROFILE_TURNS / _SESSION / _ALLOC switch profiling on at startup"""
+        turns = os.environ.get("AUTOSTREAM_PROFILE_TURNS")
+        session_id = os.environ.get("AUTOSTREAM_PROFILE_SESSION")
+        allocations = os.environ.get("AUTOSTREAM_PROFILE_ALLOC", "") not in ("", "0")
+        if not (turns or session_id):
+            return
+
+        try:
+            self.enable(
+                turns=_parse_turns(turns) if turns else None,
+                session_id=session_id,
+                allocations=allocations
+            )
+        except ValueError as e:
+            print(f"⚠️ [PROFILER] Ignoring AUTOSTREAM_PROFILE_TURNS: {e}")
+
+    def profile(self, session_id: str = ""):
+        if not self.active:
+            return _OFF
+
+        if self.session_id:
+            if session_id != self.session_id:
+                return _OFF
+        else:
+            self.turns_left -= 1
+            self.active = self.turns_left > 0
+
+        if self.allocations:
+            return self._capture_allocations(session_id)
+        return self._capture(session_id)
+
+    @contextmanager
+    def _capture(self, session_id: str):
+        self._turn += 1
+        sampler = _Sampler(threading.get_ident(), self.interval)
+        sampler.start()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            samples = sampler.stop()
+
+            path = self._write_stacks(session_id, samples, elapsed)
+            print(f"🔬 [PROFILER] Turn profile written to {path}")
+
+    @contextmanager
+    def _capture_allocations(self, session_id: str):
+        self._turn += 1
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+
+            path = self._write_allocations(session_id, snapshot, peak)
+            print(f"🔬 [PROFILER] Allocation summary written to {path}")
+
+    def _base_path(self, session_id: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        return self.output_dir / f"{session_id or 'session'}-turn{self._turn}-{stamp}"
+
+    def _write_stacks(self, session_id, samples, elapsed) -> Path:
+        base = self._base_path(session_id)
+
+        # 🔥 Collapsed stacks (flamegraph.pl / speedscope input)
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        total = sum(samples.values())
+        lines = [
+            f"session: {session_id}",
+            f"wall time: {elapsed * 1000:.1f} ms",
+            f"samples: {total} (every {self.interval * 1000:.1f} ms)",
+            "",
+            "time by component:",
+        ]
+        for category, markers in CATEGORIES.items():
+            hits = sum(
+                count for stack, count in samples.items()
+                if any(marker in stack for marker in markers)
+            )
+            share = hits / total * 100 if total else 0.0
+            lines.append(f"  {category:<16} {share:5.1f}%  (~{elapsed * share * 10:.1f} ms)")
+
+        summary_path = Path(f"{base}.summary.txt")
+        summary_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return summary_path
+
+    def _write_allocations(self, session_id, snapshot, peak) -> Path:
+        base = self._base_path(session_id)
+
+        # Timings are left out on purpose: tracemalloc distorts them
+        lines = [
+            f"session: {session_id}",
+            f"peak traced memory: {peak / 1024:.1f} KiB",
+            "",
+            "top allocations:",
+        ]
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            lines.append(f"  {stat}")
+
+        summary_path = Path(f"{base}.alloc.txt")
+        summary_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return summary_path
+
+
+# Shared instance used by main.py
+PROFILER = TurnProfiler()
@@ -1,9 +1,31 @@
 import re
 
 
+# Compiled once at import, reused on every lead-capture turn
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+NAME_PATTERN = re.compile(r"^[^\W\d_]+(?:[ .'-]+[^\W\d_]+)*\.?$")
+PLATFORM_PATTERN = re.compile(r"^\w[\w .,/&+-]*$")
+
+MAX_NAME_LENGTH = 60
+MAX_PLATFORM_LENGTH = 40
+
+
 def is_valid_email(email: str) -> bool:
     """
     Validate email using regex
     """
-    pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
+
+
+def is_valid_name(name: str) -> bool:
+    """
+    Validate a person's name (letters, spaces, dots, apostrophes, hyphens)
+    """
+    return len(name) <= MAX_NAME_LENGTH and NAME_PATTERN.match(name) is not None
+
+
+def is_valid_platform(platform: str) -> bool:
+    """
+    Validate one or more content platforms (e.g. "YouTube", "YouTube, Instagram", "yt/tiktok")
+    """
+    return len(platform) <= MAX_PLATFORM_LENGTH and PLATFORM_PATTERN.match(platform) is not None
@@ -1,6 +1,11 @@
-from agent.graph import build_graph
+import time
+import uuid
+
+from agent.graph import build_graph, LEAD_STEPS
 from agent.rag import load_knowledge_base, create_retriever
+from agent.facts import build_fact_index
 from agent.state import AgentState
+from agent.profiler import PROFILER
 
 
 RESTART_COMMANDS = [
@@ -15,12 +20,17 @@ RESTART_COMMANDS = [
 
 documents = load_knowledge_base("data/knowledge_base.json")
 retriever = create_retriever(documents)
+fact_index = build_fact_index("data/knowledge_base.json")
+
+graph = build_graph(retriever, fact_index)
 
-graph = build_graph(retriever)
+PROFILER.configure_from_env()
 
 print("AutoStream Assistant is running. Type 'exit' to quit.\n")
 
 state = AgentState()
+session_id = uuid.uuid4().hex[:8]
+print(f"DEBUG session: {session_id}")
 
 while True:
     user_input = input("You: ").strip()
@@ -32,15 +42,31 @@ while True:
     # 🔄 RESTART CONVERSATION
     if user_input.lower() in RESTART_COMMANDS:
         state = AgentState()
+        session_id = uuid.uuid4().hex[:8]
         print("Agent: 🔄 Conversation restarted. How can I help you today?")
         continue
 
+    # 🔬 PROFILER CONTROL: "/profile 5", "/profile session <id>", "/profile 3 --alloc", "/profile off"
+    if user_input.lower().startswith("/profile"):
+        try:
+            print(f"DEBUG {PROFILER.handle_command(user_input.split()[1:])}")
+        except ValueError as e:
+            print(f"DEBUG profiler: ❌ {e}")
+        continue
+
     state.user_input = user_input
-    state_dict = graph.invoke(state)
+    lead_turn = state.lead_step in LEAD_STEPS
+
+    # ⏱️ Per-turn latency (lead-capture turns skip intent detection)
+    start = time.perf_counter()
+    with PROFILER.profile(session_id):
+        state_dict = graph.invoke(state)
+    latency_ms = (time.perf_counter() - start) * 1000
     state = AgentState(**state_dict)
 
     print(
         f"DEBUG intent: {state.intent} "
-        f"(confidence: {state.intent_confidence:.2f})"
+        f"(confidence: {state.intent_confidence:.2f}) "
+        f"| {'lead capture' if lead_turn else 'full'} turn: {latency_ms:.1f} ms"
     )
     print(f"Agent: {state.response}")
@@ -0,0 +1,54 @@
+import argparse
+import json
+
+from agent.lead_store import (
+    export_leads,
+    import_leads,
+    get_lead_stats,
+    rebuild_lead_stats,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AutoStream lead export/import and analytics")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_cmd = commands.add_parser("export", help="Export leads to JSONL or CSV")
+    export_cmd.add_argument("path")
+    export_cmd.add_argument("--format", choices=["jsonl", "csv"])
+
+    import_cmd = commands.add_parser("import", help="Import leads from JSONL or CSV")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--format", choices=["jsonl", "csv"])
+    import_cmd.add_argument(
+        "--allow-duplicates",
+        action="store_true",
+        help="Keep rows whose email already exists"
+    )
+
+    stats_cmd = commands.add_parser("stats", help="Show lead counters")
+    stats_cmd.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute counters from leads.json"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        count = export_leads(args.path, args.format)
+        print(f"📤 Exported {count} leads to {args.path}")
+
+    elif args.command == "import":
+        count, skipped = import_leads(args.path, args.format, skip_existing=not args.allow_duplicates)
+        print(f"📥 Imported {count} leads from {args.path}")
+        if skipped:
+            print(f"⚠️ Skipped {skipped} malformed rows")
+
+    elif args.command == "stats":
+        stats = rebuild_lead_stats() if args.rebuild else get_lead_stats()
+        print(json.dumps(stats, indent=4))
+
+
+if __name__ == "__main__":
+    main()